@@ -1,17 +1,23 @@
 import argparse
 import json
 import logging
+import os
 import re
 import sys
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from pathlib import Path
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Tuple
 
 # --- Configuration Constants ---
 DEFAULT_CHARTS_DIR = "charts"
 DEFAULT_MANIFESTS_DIR = "manifests"
 
+# Separators between version segments, e.g. '1.2.3-rc.1+build'
+_VERSION_SPLIT_RE = re.compile(r'[.\-+]')
+# Any non-whitespace byte; used to tell blank manifests from malformed ones
+_NON_BLANK_RE = re.compile(rb'\S')
+
 # --- Setup Logging ---
 logging.basicConfig(
     level=logging.INFO,
@@ -33,19 +39,16 @@ def _parse_chart_key(name: str) -> tuple:
     return (name[:idx], name[idx + 2:])
 
 
-def _version_sort_key(version: str) -> List:
+@lru_cache(maxsize=None)
+def _version_sort_key(version: str) -> Tuple:
     """
     Best-effort numeric sort key for semver-like strings so that
     '2.10.0' sorts after '2.9.0'.  Non-numeric segments sort lexically.
     """
-    parts = re.split(r'[.\-+]', version)
-    key = []
-    for p in parts:
-        if p.isdigit():
-            key.append((0, int(p)))
-        else:
-            key.append((1, p))
-    return key
+    return tuple(
+        (0, int(p)) if p.isdigit() else (1, p)
+        for p in _VERSION_SPLIT_RE.split(version)
+    )
 
 
 def _pick_latest_per_family(paths, path_to_name_fn) -> list:
@@ -54,36 +57,60 @@ def _pick_latest_per_family(paths, path_to_name_fn) -> list:
     entry with the highest version in each family.
 
     *path_to_name_fn* converts a path to the name string to parse
-    (e.g. Path.stem or str).
+    (e.g. _manifest_stem or str).
     """
     families: dict = defaultdict(list)
     for p in paths:
         family, version = _parse_chart_key(path_to_name_fn(p))
         families[family].append((version, p))
 
-    result = []
-    for family in sorted(families):
-        entries = families[family]
-        entries.sort(key=lambda e: _version_sort_key(e[0]), reverse=True)
-        result.append(entries[0][1])
-    return result
+    # max() keeps the first of equal keys, like the stable reverse sort it
+    # replaces, but needs a single O(n) pass per family.
+    return [
+        max(families[family], key=lambda e: _version_sort_key(e[0]))[1]
+        for family in sorted(families)
+    ]
+
+
+def _manifest_stem(manifest_path: str) -> str:
+    """Return the file name of *manifest_path* without its extension."""
+    return os.path.splitext(os.path.basename(manifest_path))[0]
 
 
-def _check_manifest(manifest_path: Path) -> dict:
+def _check_manifest(manifest_path: str) -> dict:
     """
     Validate a single manifest file. Returns a result dict with the path,
     status ('valid', 'invalid', or 'empty'), and an optional error message.
+
+    Zero-byte files are rejected from their size alone, without reading them.
+    Other files are read with a single pread() of the size fstat() already
+    reported and the bytes are parsed without decoding them first.
     """
     try:
-        content = manifest_path.read_text(encoding="utf-8")
-        if not content.strip():
-            return {"path": str(manifest_path), "status": "invalid", "error": "file is empty"}
-        json.loads(content)
-        return {"path": str(manifest_path), "status": "valid"}
-    except json.JSONDecodeError as e:
-        return {"path": str(manifest_path), "status": "invalid", "error": str(e)}
+        with open(manifest_path, "rb") as fh:
+            fd = fh.fileno()
+            size = os.fstat(fd).st_size
+            if size == 0:
+                return {"path": manifest_path, "status": "invalid", "error": "file is empty"}
+            content = os.pread(fd, size, 0)
+            if not _NON_BLANK_RE.search(content):
+                return {"path": manifest_path, "status": "invalid", "error": "file is empty"}
+            json.loads(content)
+        return {"path": manifest_path, "status": "valid"}
+    except ValueError as e:
+        # json.JSONDecodeError and invalid UTF-8 are both ValueError subclasses.
+        return {"path": manifest_path, "status": "invalid", "error": str(e)}
     except OSError as e:
-        return {"path": str(manifest_path), "status": "invalid", "error": str(e)}
+        return {"path": manifest_path, "status": "invalid", "error": str(e)}
+
+
+def _check_chunk(manifest_paths: list) -> list:
+    """
+    Validate a batch of manifests in a worker process and return only the
+    invalid results; valid files need nothing sent back to the parent.
+    """
+    results = (_check_manifest(p) for p in manifest_paths)
+    return [r for r in results if r["status"] == "invalid"]
 
 
 def main():
@@ -108,56 +135,66 @@ def main():
     )
     args = parser.parse_args()
 
-    charts_dir = Path(args.charts_dir)
-    manifests_dir = Path(args.manifests_dir)
+    # Plain strings throughout: no Path objects are built per entry.
+    charts_dir = os.path.normpath(args.charts_dir)
+    manifests_dir = os.path.normpath(args.manifests_dir)
 
-    if not charts_dir.is_dir():
+    if not os.path.isdir(charts_dir):
         logger.critical(f"Charts directory not found: {charts_dir}")
         sys.exit(1)
 
-    # --- Step 1: Discover chart directories and expected manifests ---
-    chart_dirs = sorted(
-        p for p in charts_dir.iterdir()
-        if p.is_dir() and "__" in p.name
-    )
+    # --- Step 1: Discover chart directories ---
+    # os.scandir exposes the d_type returned by readdir, so is_dir() does not
+    # need an extra stat() per entry.
+    with os.scandir(charts_dir) as it:
+        chart_dirs = sorted(
+            (e for e in it if "__" in e.name and e.is_dir(follow_symlinks=False)),
+            key=lambda e: e.name,
+        )
     total_charts = len(chart_dirs)
     logger.info(f"Found {total_charts} chart directories in '{charts_dir}'.")
 
-    # Build expected manifest paths from chart directories
-    expected_manifests = {
-        d.name: manifests_dir / f"{d.name}.json" for d in chart_dirs
-    }
-
-    missing = []
-    existing_from_charts = []
-    for name, manifest_path in expected_manifests.items():
-        if manifest_path.is_file():
-            existing_from_charts.append(manifest_path)
-        else:
-            missing.append(manifest_path)
-
     # --- Step 2: Discover ALL manifest files on disk (catches orphans) ---
-    all_manifest_files = sorted(manifests_dir.glob("*.json")) if manifests_dir.is_dir() else []
+    manifest_entries = []
+    if os.path.isdir(manifests_dir):
+        with os.scandir(manifests_dir) as it:
+            manifest_entries = [
+                e for e in it if e.name.endswith(".json") and e.is_file()
+            ]
+    all_manifest_files = sorted(e.path for e in manifest_entries)
     total_manifests = len(all_manifest_files)
     logger.info(f"Found {total_manifests} manifest files in '{manifests_dir}'.")
 
-    # Orphan manifests: exist on disk but have no matching chart directory
+    # Missing and orphan manifests are plain set differences of the scanned
+    # names, so neither needs a per-entry stat() or membership scan.
     chart_names = {d.name for d in chart_dirs}
-    orphan_manifests = [
-        m for m in all_manifest_files if m.stem not in chart_names
-    ]
+    manifest_stems = {e.name[:-len(".json")] for e in manifest_entries}
+    # Missing manifests: chart directories without a scanned manifest file
+    missing = sorted(
+        os.path.join(manifests_dir, f"{name}.json")
+        for name in chart_names - manifest_stems
+    )
+    # Orphan manifests: exist on disk but have no matching chart directory
+    orphan_manifests = sorted(
+        os.path.join(manifests_dir, f"{name}.json")
+        for name in manifest_stems - chart_names
+    )
 
     # --- Step 3: Validate all manifest files concurrently ---
+    # Parsing is CPU-bound, so use processes to get past the GIL. Files are
+    # split into a few shards per worker: each task carries a list of paths
+    # and sends back only the failures, which keeps pickling to a minimum
+    # while still leaving enough shards to balance uneven file sizes.
     logger.info(f"Validating {total_manifests} manifest files (max workers: {args.max_workers})...")
+    shard_size = max(1, -(-total_manifests // (args.max_workers * 4)))
+    shards = [
+        all_manifest_files[i:i + shard_size]
+        for i in range(0, total_manifests, shard_size)
+    ]
     invalid = []
-    with ThreadPoolExecutor(max_workers=args.max_workers) as executor:
-        futures = {
-            executor.submit(_check_manifest, m): m for m in all_manifest_files
-        }
-        for future in as_completed(futures):
-            result = future.result()
-            if result["status"] == "invalid":
-                invalid.append(result)
+    with ProcessPoolExecutor(max_workers=args.max_workers) as executor:
+        for shard_invalid in executor.map(_check_chunk, shards):
+            invalid.extend(shard_invalid)
 
     # --- Step 4: Report ---
     display_missing = missing
@@ -165,11 +202,11 @@ def main():
     display_orphans = orphan_manifests
 
     if args.summary:
-        display_missing = _pick_latest_per_family(missing, lambda p: p.stem)
+        display_missing = _pick_latest_per_family(missing, _manifest_stem)
         display_invalid = _pick_latest_per_family(
-            invalid, lambda r: Path(r["path"]).stem
+            invalid, lambda r: _manifest_stem(r["path"])
         )
-        display_orphans = _pick_latest_per_family(orphan_manifests, lambda p: p.stem)
+        display_orphans = _pick_latest_per_family(orphan_manifests, _manifest_stem)
 
     if display_missing:
         label = "families" if args.summary else "manifests"
@@ -14,9 +14,16 @@ import json
 import os
 import re
 import yaml
-from collections import Counter, defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, List, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# libyaml's C loader when PyYAML was built with it, the pure-Python one otherwise
+try:
+    from yaml import CSafeLoader as _YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlSafeLoader
 
 # ───────────────────────────── Constants ──────────────────────────────
 # Order for sorting risk levels (lower number means higher risk)
@@ -31,8 +38,47 @@ RISK_DISPLAY_MAP: Dict[int, str] = {
     3: "Low",
     DEFAULT_RISK_SORT_VALUE: "—"
 }
+# Overview risk cell per sorted risk value; unknown risk renders as a bare dash
+RISK_CELLS: Tuple[str, ...] = tuple(
+    f'{{{{< risk "{RISK_DISPLAY_MAP[rank]}" >}}}}' if rank != DEFAULT_RISK_SORT_VALUE else "—"
+    for rank in range(DEFAULT_RISK_SORT_VALUE + 1)
+)
 # Default API group for core resources when not specified
 CORE_API_GROUP: str = "core"
+# Rule page up to the abuse scenarios, which are appended per command.
+# Doubled braces are literal Hugo shortcode delimiters.
+RULE_PAGE_TEMPLATE: str = (
+    "---\n"
+    "id: {id}\n"
+    "title: \"{name}\"\n"
+    "description: \"{description}\"\n"
+    "category: {category}\n"
+    "risk_level: {risk_level}\n"
+    "date: \"\"\n"
+    "---\n"
+    "## Overview\n\n"
+    "| Field | Value |\n"
+    "|-------|-------|\n"
+    "| ID | {id} |\n"
+    "| Name | {name} |\n"
+    "| Risk Category | {category} |\n"
+    "| Risk Level | {{{{< risk {risk_level_display} >}}}} |\n"
+    "| Role Type | {role_type} |\n"
+    "| API Groups | {api_groups} |\n"
+    "| Resources | {resources} |\n"
+    "| Risky Verb Combinations | {verb_groups} |\n"
+    "| Tags | {tags} |\n\n"
+    "## Description\n\n"
+    "{description}\n"
+    "## Abuse Scenarios\n\n"
+)
+# Slice used for identities without any bindings or workloads
+EMPTY_SLICE: slice = slice(0, 0)
+# Placeholders for identity sections without bindings or workloads
+NO_BINDINGS_MD: str = "_No explicit RBAC bindings._\n\n"
+NO_WORKLOADS_MD: str = "_No workloads use this ServiceAccount._\n\n"
+# Runs of characters that are not allowed in anchor IDs
+SLUG_INVALID_RE: re.Pattern = re.compile(r"[^a-z0-9]+")
 
 # ───────────────────────────── Markdown helpers ──────────────────────────────
 def h(level: int, text: str) -> str:
@@ -45,19 +91,49 @@ def bullet(text: str) -> str:
     return f"- {text}\n"
 
 
-def table(headers: List[str], rows: List[List[str]]) -> str:
-    """Generates a Markdown table."""
-    header_line = "|" + "|".join(headers) + "|\n"
-    separator_line = "|" + "|".join("---" for _ in headers) + "|\n"
-    body_lines = "".join("|" + "|".join(row) + "|\n" for row in rows)
-    return header_line + separator_line + body_lines + "\n"
+@lru_cache(maxsize=None)
+def table_header(headers: Tuple[str, ...]) -> str:
+    """Generates the header and separator lines of a Markdown table."""
+    return f"|{'|'.join(headers)}|\n{'|---' * len(headers)}|\n"
+
 
+def write_table(write: Callable[[str], Any], headers: List[str], rows: Iterable[List[str]]) -> None:
+    """Writes a Markdown table row by row, so the body is never joined in memory."""
+    write(table_header(tuple(headers)))
+    for row in rows:
+        write(f"|{'|'.join(row)}|\n")
+    write("\n")
 
+
+@lru_cache(maxsize=4096)
 def slug(text: str) -> str:
     """Turns a string into a stable anchor ID suitable for Markdown/HTML."""
     text = text or "none"
     # Replace non-alphanumeric characters with hyphens, convert to lowercase, and strip leading/trailing hyphens
-    return "sa-" + re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return "sa-" + SLUG_INVALID_RE.sub("-", text.lower()).strip("-")
+
+def format_resource(api_group: str, resource: str, resource_name: str) -> str:
+    """Formats a permission's target as 'group/resource', noting any resourceName restriction."""
+    target = f"{api_group or CORE_API_GROUP}/{resource}"
+    if target == "*/*":
+        target = "*"
+    if resource_name and resource_name != "*":
+        return f"{target} **(restricted to: {resource_name})**"
+    return target
+
+@lru_cache(maxsize=4096)
+def tag_shortcode(tag: str) -> str:
+    """Generates the Hugo shortcode for a tag."""
+    return f"{{{{< tag \"{tag}\" >}}}}"
+
+
+@lru_cache(maxsize=64)
+def risk_shortcode(risk_level: str, quoted: bool = True) -> str:
+    """Generates the Hugo shortcode for a risk level, with or without quotes."""
+    if quoted:
+        return f'{{{{< risk "{risk_level}" >}}}}'
+    return f"{{{{< risk {risk_level} >}}}}"
+
 
 def format_tags_for_markdown(tags: Optional[List[str]], max_display: int = 5) -> str:
     """
@@ -66,113 +142,151 @@ def format_tags_for_markdown(tags: Optional[List[str]], max_display: int = 5) ->
     """
     if not tags:
         return ""
+    return format_tag_tuple(tuple(tags), max_display)
+
+@lru_cache(maxsize=4096)
+def format_tag_tuple(tags: Tuple[str, ...], max_display: int) -> str:
+    """Cached body of format_tags_for_markdown; roles reused across bindings repeat the same tags."""
     sorted_tags = sorted(tags)
     displayed_tags = sorted_tags[:max_display]
     remaining_tags_count = len(sorted_tags) - max_display
 
-    tag_shortcodes = [f"{{{{< tag \"{tag}\" >}}}}" for tag in displayed_tags]
+    tag_shortcodes = [tag_shortcode(tag) for tag in displayed_tags]
     if remaining_tags_count > 0:
         tag_shortcodes.append(f"(+{remaining_tags_count} more)")
     return " ".join(tag_shortcodes)
 
-def get_nested_value(data: Dict[str, Any], keys: List[str], default: Any = None) -> Any:
+def get_helm_metadata(meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the chart's metadata.extra.helm block, or {} if it is missing or malformed."""
+    extra = meta.get("extra")
+    helm = extra.get("helm") if isinstance(extra, dict) else None
+    return helm if isinstance(helm, dict) else {}
+
+def version_tuple(v: str) -> Tuple[int, int, int]:
     """
-    Safely retrieves a value from a nested dictionary using a list of keys.
-    Returns the default value if any key in the path is not found or if an intermediate
-    value is not a dictionary.
+    Returns (major, minor, patch) for a version string such as "v1.2.3-rc.1",
+    padding missing parts with zeros. Invalid versions map to (0, 0, 0).
     """
-    current = data
-    for key in keys:
-        if isinstance(current, dict) and key in current:
-            current = current[key]
-        else:
-            return default
-    return current
+    v = v.split('-')[0]  # Ignore any additional info after the version number
+    parts = v.lstrip('v').split('.')[:3]  # Only consider major.minor.patch
+    parts += ['0'] * (3 - len(parts))
+    try:
+        return int(parts[0]), int(parts[1]), int(parts[2])
+    except ValueError:
+        return 0, 0, 0
+
+@lru_cache(maxsize=4096)
+def get_version_order(v: str) -> str:
+    """
+    Creates a semantic version order key suitable for Hugo's string sorting.
+    Each part of version_tuple() is hex-encoded with left padding to 4
+    characters and prefixed with 'f', which keeps the key lexicographically
+    sortable in Hugo. Invalid versions sort consistently as all zeros.
+    """
+    return "f%04xf%04xf%04x" % version_tuple(v)
+
+def slices_by_group(counts: Dict[str, int]) -> Dict[str, slice]:
+    """
+    Maps each key of *counts* to its slice of a list sorted by group, where
+    the groups appear in the dict's order and each holds counts[key] items.
+    """
+    slices = {}
+    start = 0
+    for key, count in counts.items():
+        slices[key] = slice(start, start + count)
+        start += count
+    return slices
 
 # ───────────────────────────── Conversion logic ──────────────────────────────
-def build_markdown(data: Dict[str, Any], rules_data: Dict[int, Dict[str, Any]]) -> str:
+def render_markdown(data: Dict[str, Any], rules_data: Dict[int, Dict[str, Any]],
+                    write: Callable[[str], Any]) -> None:
     """
-    Builds the Hugo-ready Markdown content from the parsed JSON data.
+    Renders the Hugo-ready Markdown content from the parsed JSON data, passing
+    each fragment to *write* as soon as it is produced (e.g. a file's write
+    method), so the page never has to be held in memory as a whole.
 
     Args:
         data: The parsed JSON data representing the knowledge base entry.
         rules_data: A dictionary of security rules, keyed by rule ID.
-
-    Returns:
-        A string containing the full Markdown content for the Hugo page.
+        write: Callable that receives successive chunks of the page.
     """
     meta = data["metadata"]
     name, version = meta["name"], meta["version"]
 
-    description = get_nested_value(meta, ['extra', 'helm', 'description'], "")
-    sources = get_nested_value(meta, ['extra', 'helm', 'sources'], [])
-    categories = get_nested_value(meta, ['extra', 'helm', 'keywords'], []) or []
+    helm = get_helm_metadata(meta)
+    description = helm.get("description", "")
+    sources = helm.get("sources", [])
+    categories = helm.get("keywords", []) or []
 
-    perms = sorted(data.get("serviceAccountPermissions", []),
-                   key=lambda x: (RISK_ORDER.get(x.get("riskLevel", ""), DEFAULT_RISK_SORT_VALUE),
-                                  x.get("roleName", "")))
-    workloads = sorted(data.get("serviceAccountWorkloads", []),
-                       key=lambda x: (x.get("workloadType", ""), x.get("workloadName", ""), x.get("containerName", "")))
+    # Bound once; these are called for every permission in the sort keys below
+    risk_rank = RISK_ORDER.get
+    default_rank = DEFAULT_RISK_SORT_VALUE
 
-    # Index permissions and workloads by ServiceAccount name for easy lookup
-    perms_by_sa: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for p in perms:
-        perms_by_sa[p["serviceAccountName"]].append(p)
+    perms = data.get("serviceAccountPermissions", [])
+    workloads = data.get("serviceAccountWorkloads", [])
 
-    wl_by_sa: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for w in workloads:
-        wl_by_sa[w["serviceAccountName"]].append(w)
+    def permission_sort_key(p: Dict[str, Any]) -> tuple:
+        """Sort permissions by risk level, then resource, apiGroup, roleType, roleName and verbs."""
+        return (
+            risk_rank(p["riskLevel"], default_rank),
+            p["resourceName"],
+            p["resource"],
+            p["apiGroup"] or CORE_API_GROUP,
+            p["roleType"],
+            p["roleName"],
+            ",".join(p.get("verbs", [])) # Join the verbs array with commas, to make it a single string
+        )
 
-    def get_highest_risk_for_sa(sa_name: str) -> int:
-        """Helper function to get the highest risk level (lowest sort value) for a service account."""
-        risks = {p["riskLevel"] for p in perms_by_sa[sa_name]}
-        return min((RISK_ORDER.get(r, DEFAULT_RISK_SORT_VALUE) for r in risks), default=DEFAULT_RISK_SORT_VALUE)
+    def permission_rows(sorted_perms: List[Dict[str, Any]], quoted_risk: bool,
+                        risk_rules: set) -> Iterable[List[str]]:
+        """
+        Yields the permission table rows, adding each permission's matched
+        rule IDs to *risk_rules* on the way so the list is walked only once.
+        """
+        for p in sorted_perms:
+            risk_rules.update(rule['id'] for rule in p.get('matchedRiskRules', []))
+            yield [
+                f"{p['roleType']} `{p['roleName']}`",
+                format_resource(p["apiGroup"], p["resource"], p.get("resourceName", "")),
+                " · ".join(p["verbs"]),
+                risk_shortcode(p["riskLevel"], quoted_risk),
+                format_tags_for_markdown(p.get("tags"))
+            ]
+
+    # Count permissions and workloads per ServiceAccount, collecting the
+    # deduplicated tags and each SA's highest risk level (lowest sort value)
+    # in the same pass. Counter keys keep first-seen order, which is what
+    # groups the sorted lists below.
+    perm_counts: Counter = Counter()
+    risk_counts: Counter = Counter()
+    highest_risk_by_sa: Dict[str, int] = {}
+    tags = set()
+    for p in perms:
+        sa = p["serviceAccountName"]
+        risk_level = p["riskLevel"]
+        perm_counts[sa] += 1
+        risk_counts[risk_level] += 1
+        rank = risk_rank(risk_level, default_rank)
+        if rank < highest_risk_by_sa.get(sa, default_rank + 1):
+            highest_risk_by_sa[sa] = rank
+        perm_tags = p.get("tags")
+        if perm_tags:
+            tags.update(perm_tags)
+
+    wl_counts: Counter = Counter()
+    for w in workloads:
+        wl_counts[w["serviceAccountName"]] += 1
 
     # Sort service accounts for the overview table by highest risk first, then by name
     sa_data = sorted(data.get("serviceAccountData", []),
-                     key=lambda x: (get_highest_risk_for_sa(x.get("serviceAccountName", "")),
+                     key=lambda x: (highest_risk_by_sa.get(x.get("serviceAccountName", ""), default_rank),
                                     x.get("serviceAccountName", "")))
-
-    # Calculate overview counts
-    perm_counts = Counter(p["serviceAccountName"] for p in perms)
-    wl_counts   = Counter(w["serviceAccountName"] for w in workloads)
-    risk_counts = Counter(p["riskLevel"] for p in perms)
-
-    # Extract and deduplicate tags from all service account permissions
-    tags = set()
-    for p in perms:
-        perm_tags = p.get("tags", []) or []
-        tags.update(perm_tags)
+    sa_names = {sa.get("serviceAccountName") for sa in sa_data}
 
     # Add a tag based on the first letter of the application name
     letter = name[0].upper() if name else ""
     tags.add(f"letter-{letter}")
 
-    def get_version_order(v: str) -> str:
-        """
-        Creates a semantic version order key suitable for Hugo's string sorting.
-        Pads version parts with zeros and converts to hex for consistent length.
-        The 'f' prefix ensures lexicographical sorting in Hugo.
-        """
-        v = v.split('-')[0]  # Ignore any additional info after the version number
-        v = v.lstrip('v')
-        parts = v.split('.')[:3]  # Only consider the first 3 parts (major.minor.patch)
-        while len(parts) < 3:
-            parts.append('0')
-        try:
-            major = int(parts[0])
-            minor = int(parts[1])
-            patch = int(parts[2])
-            # Convert to hex with left padding to 4 characters for consistent length
-            major_hex = f"{major:04x}"
-            minor_hex = f"{minor:04x}"
-            patch_hex = f"{patch:04x}"
-            # Combine with 'f' prefix for Hugo's string sorting
-            return f"f{major_hex}f{minor_hex}f{patch_hex}"
-        except (ValueError, IndexError):
-            # Fallback for invalid versions, ensures they sort consistently at the end
-            return "f0000f0000f0000"
-
     # ── Page Header (YAML Front Matter) ──
     # Ensure version starts with 'v' for consistency in Hugo
     if not version.startswith("v"):
@@ -185,8 +299,8 @@ def build_markdown(data: Dict[str, Any], rules_data: Dict[int, Dict[str, Any]])
         f"version: {version}",
         f"version_order: {get_version_order(version)}",
         "date: \"\"", # Keep as empty string as per original
-        f"service_accounts: {len(perms_by_sa)}",
-        f"workloads: {len(wl_by_sa)}",
+        f"service_accounts: {len(perm_counts.keys() | sa_names)}",
+        f"workloads: {len(wl_counts)}",
         f"bindings: {len(perms)}",
         f"critical_findings: {risk_counts['Critical']}",
         f"high_findings: {risk_counts['High']}",
@@ -197,132 +311,110 @@ def build_markdown(data: Dict[str, Any], rules_data: Dict[int, Dict[str, Any]])
         "---",
         "" # For the extra newline after front matter
     ]
-    out = "\n".join(front_matter_lines)
+    write("\n".join(front_matter_lines))
 
     # ── Description Section ──
-    out += h(2, "Description")
-    out += description + "\n\n"
+    write(h(2, "Description"))
+    write(description + "\n\n")
 
     # Add sources if available
     if sources:
         for source in sources:
-            out += bullet(source)
-        out += "\n"
+            write(bullet(source))
+        write("\n")
 
     # ── Overview Table Section ──
-    out += h(2, "Overview")
-    overview_rows = []
+    write(h(2, "Overview"))
+    # Rows are fixed-width, so each is written as a single f-string rather
+    # than collected as cell lists for write_table
+    write(table_header(("Identity", "Namespace", "Automount", "Secrets",
+                        "Permissions", "Workloads", "Risk")))
+
+    # Bindings whose ServiceAccount has no entry in serviceAccountData; shared
+    # by the overview row and the identities section below
+    orphaned_bindings = [p for p in perms if p["serviceAccountName"] not in sa_names]
 
     # Handle orphaned bindings if there are permissions but no service accounts
-    orphaned_bindings = [p for p in perms if not any(sa.get("serviceAccountName") == p["serviceAccountName"] for sa in sa_data)]
     if orphaned_bindings and not sa_data:
-        highest_risk_val = min((RISK_ORDER.get(p["riskLevel"], DEFAULT_RISK_SORT_VALUE) for p in orphaned_bindings))
-        risk_display = RISK_DISPLAY_MAP[highest_risk_val]
-        risk_cell = f'{{{{< risk "{risk_display}" >}}}}' if risk_display != "—" else "—"
-
-        overview_rows.append([
-            "`(orphaned-bindings)`",
-            "—",  # namespace
-            "—",  # automount
-            "—",  # secrets
-            str(len(orphaned_bindings)),  # permissions count
-            "0",  # workloads count
-            risk_cell
-        ])
+        risk_cell = RISK_CELLS[min(risk_rank(p["riskLevel"], default_rank) for p in orphaned_bindings)]
+        # Namespace, automount and secrets are unknown; no workloads
+        write(f"|`(orphaned-bindings)`|—|—|—|{len(orphaned_bindings)}|0|{risk_cell}|\n")
 
+    # Anchor IDs per ServiceAccount, reused by the identity headers below
+    anchors: Dict[str, str] = {}
     for sa in sa_data:
         sa_name = sa["serviceAccountName"]
-        anchor  = slug(sa_name)
-        highest_risk_val = get_highest_risk_for_sa(sa_name)
-        risk_display = RISK_DISPLAY_MAP[highest_risk_val]
-        risk_cell = f'{{{{< risk "{risk_display}" >}}}}' if risk_display != "—" else "—"
-
-        overview_rows.append([
-            f"[`{sa_name or '—'}`](#{anchor})",
-            sa["namespace"],
-            "✅" if sa["automountToken"] else "❌",
-            ", ".join(sa["secrets"] or []) or "—",
-            str(perm_counts.get(sa_name, 0)),
-            str(wl_counts.get(sa_name, 0)),
-            risk_cell
-        ])
-    out += table(
-        ["Identity", "Namespace", "Automount", "Secrets",
-         "Permissions", "Workloads", "Risk"],
-        overview_rows,
-    )
-    out += (
+        anchor  = anchors[sa_name] = slug(sa_name)
+        write(
+            f"|[`{sa_name or '—'}`](#{anchor})"
+            f"|{sa['namespace']}"
+            f"|{'✅' if sa['automountToken'] else '❌'}"
+            f"|{', '.join(sa['secrets'] or []) or '—'}"
+            f"|{perm_counts.get(sa_name, 0)}"
+            f"|{wl_counts.get(sa_name, 0)}"
+            f"|{RISK_CELLS[highest_risk_by_sa.get(sa_name, default_rank)]}|\n"
+        )
+    write("\n")
+    write(
         "\n> *Numbers in the last two columns indicate how many bindings or "
         "workloads involve each ServiceAccount.*\n\n"
         "---\n\n"
     )
 
     # ── Per-identity Sections ──
-    out += h(2, "Identities")
+    write(h(2, "Identities"))
 
     # Handle orphaned bindings section if there are permissions but no service accounts
-    orphaned_bindings = [p for p in perms if not any(sa.get("serviceAccountName") == p["serviceAccountName"] for sa in sa_data)]
     if orphaned_bindings and not sa_data:
-        out += "### ⚠️ `(orphaned-bindings)` {#orphaned-bindings}\n\n"
-        out += "**Warning:** The following RBAC bindings exist but are not associated with any active service accounts in the cluster.\n\n"
+        write("### ⚠️ `(orphaned-bindings)` {#orphaned-bindings}\n\n")
+        write("**Warning:** The following RBAC bindings exist but are not associated with any active service accounts in the cluster.\n\n")
 
-        # Sort orphaned permissions by risk level, then resource, apiGroup, roleType, roleName and verbs
-        sorted_perms = sorted(orphaned_bindings, key=lambda p: (
-            RISK_ORDER.get(p["riskLevel"], DEFAULT_RISK_SORT_VALUE),
-            p["resourceName"],
-            p["resource"],
-            p["apiGroup"] or CORE_API_GROUP,
-            p["roleType"],
-            p["roleName"],
-            ",".join(p.get("verbs", [])) # Join the verbs array with commas, to make it a single string
-        ))
+        sorted_perms = sorted(orphaned_bindings, key=permission_sort_key)
 
-        out += h(4, f"🔑 Permissions ({len(sorted_perms)})").rstrip() + "\n"
-        perm_rows = [
-            [
-                f"{p['roleType']} `{p['roleName']}`",
-                (lambda x, rn: f"{x} **(restricted to: {rn})**" if rn and rn != "*" else x)(
-                    (lambda x: "*" if x == "*/*" else x)(f"{p['apiGroup'] or CORE_API_GROUP}/{p['resource']}"),
-                    p.get('resourceName', '')
-                ),
-                " · ".join(p["verbs"]),
-                f'{{{{< risk "{p["riskLevel"]}" >}}}}',
-                format_tags_for_markdown(p.get("tags"))
-            ]
-            for p in sorted_perms
-        ]
-        out += table(["Role", "Resource", "Verbs", "Risk", "Tags"], perm_rows)
-
-        # Add potential abuse section for orphaned bindings
+        write(h(4, f"🔑 Permissions ({len(sorted_perms)})").rstrip() + "\n")
         all_risk_rules = set()
-        for perm in sorted_perms:
-            risk_rules = [rule['id'] for rule in perm.get('matchedRiskRules', [])]
-            all_risk_rules.update(risk_rules)
+        write_table(write, ["Role", "Resource", "Verbs", "Risk", "Tags"],
+                    permission_rows(sorted_perms, True, all_risk_rules))
 
+        # Add potential abuse section for orphaned bindings
         if all_risk_rules:
-            out += h(4, f"⚠️ Potential Abuse ({len(all_risk_rules)})").rstrip() + "\n"
-            out += "The following security risks were found based on the above permissions:\n\n"
-            for rule_id in sorted(all_risk_rules):
-                if rule_id in rules_data:
-                    rule = rules_data[rule_id]
-                    out += f"- [{rule['name']}](/rules/{rule_id})\n"
-            out += "\n"
-
-        out += "---\n\n"
-
-    def sort_sa_identities_key(sa: Dict[str, Any]) -> tuple:
-        """
-        Sort key for service accounts in the identities section:
-        highest risk first, then by descending permission count, then by name.
-        """
-        top_risk = get_highest_risk_for_sa(sa["serviceAccountName"])
-        return (top_risk,
-                -perm_counts.get(sa["serviceAccountName"], 0), # Descending by permission count
-                sa["serviceAccountName"]) # Ascending by name
-
-    for sa in sorted(sa_data, key=sort_sa_identities_key):
+            write(h(4, f"⚠️ Potential Abuse ({len(all_risk_rules)})").rstrip() + "\n")
+            write("The following security risks were found based on the above permissions:\n\n")
+            for rule_id in sorted(all_risk_rules & rules_data.keys()):
+                write(f"- [{rules_data[rule_id]['name']}](/rules/{rule_id})\n")
+            write("\n")
+
+        write("---\n\n")
+
+    # Identities: highest risk first, then by descending permission count, then by name.
+    # sa_data is already ordered by (risk, name), so a stable sort on
+    # (risk, -count) yields that order without comparing names again.
+    identities = sorted(sa_data, key=lambda sa: (
+        highest_risk_by_sa.get(sa["serviceAccountName"], default_rank),
+        -perm_counts.get(sa["serviceAccountName"], 0) # Descending by permission count
+    ))
+
+    # Sort all permissions (and workloads) once, grouped by ServiceAccount in
+    # first-seen order; each identity then takes its contiguous slice
+    # instead of sorting its own list.
+    perm_group = {sa: i for i, sa in enumerate(perm_counts)}
+    perms_grouped = sorted(perms, key=lambda p: (
+        (perm_group[p["serviceAccountName"]],) + permission_sort_key(p)
+    )) if sa_data else []
+    perm_slices = slices_by_group(perm_counts)
+
+    wl_group = {sa: i for i, sa in enumerate(wl_counts)}
+    workloads_grouped = sorted(workloads, key=lambda w: (
+        wl_group[w["serviceAccountName"]],
+        w.get("workloadType", ""),
+        w.get("workloadName", ""),
+        w.get("containerName", "")
+    )) if sa_data else []
+    wl_slices = slices_by_group(wl_counts)
+
+    for sa in identities:
         sa_name = sa["serviceAccountName"]
-        anchor  = slug(sa_name)
+        anchor  = anchors[sa_name]
 
         # Identity header
         header_parts = [
@@ -333,75 +425,79 @@ def build_markdown(data: Dict[str, Any], rules_data: Dict[int, Dict[str, Any]])
         secrets = ", ".join(sa["secrets"] or [])
         if secrets:
             header_parts.append(f"  |  **Secrets:** {secrets}")
-        out += " ".join(header_parts) + "\n\n" # Join parts and add final newlines
+        write(" ".join(header_parts) + "\n\n") # Join parts and add final newlines
 
         # Permissions section
-        sa_perms = perms_by_sa[sa_name]
-        out += h(4, f"🔑 Permissions ({len(sa_perms)})").rstrip() + "\n"
-        if sa_perms:
-            # Sort permissions by risk level, then resource, apiGroup, roleType, roleName and verbs
-            sorted_perms = sorted(sa_perms, key=lambda p: (
-                RISK_ORDER.get(p["riskLevel"], DEFAULT_RISK_SORT_VALUE),
-                p["resourceName"],
-                p["resource"],
-                p["apiGroup"] or CORE_API_GROUP,
-                p["roleType"],
-                p["roleName"],
-                ",".join(p.get("verbs", [])) # Join the verbs array with commas, to make it a single string
-            ))
-            perm_rows = [
-                [
-                    f"{p['roleType']} `{p['roleName']}`",
-                    (lambda x, rn: f"{x} **(restricted to: {rn})**" if rn and rn != "*" else x)(
-                        (lambda x: "*" if x == "*/*" else x)(f"{p['apiGroup'] or CORE_API_GROUP}/{p['resource']}"),
-                        p.get('resourceName', '')
-                    ),
-                    " · ".join(p["verbs"]),
-                    f"{{{{< risk {p['riskLevel']} >}}}}",
-                    format_tags_for_markdown(p.get("tags"))
-                ]
-                for p in sorted_perms
-            ]
-            out += table(["Role", "Resource", "Verbs", "Risk", "Tags"], perm_rows)
-        else:
-            out += "_No explicit RBAC bindings._\n\n"
-
-        # Potential Abuse section
+        sa_perms = perms_grouped[perm_slices.get(sa_name, EMPTY_SLICE)]
+        write(h(4, f"🔑 Permissions ({len(sa_perms)})").rstrip() + "\n")
         if sa_perms:
-            # Collect all unique rule IDs from all permissions
+            # Unique rule IDs from all permissions, collected while the rows are written
             all_risk_rules = set()
-            for perm in sa_perms:
-                risk_rules = [rule['id'] for rule in perm.get('matchedRiskRules', [])]
-                all_risk_rules.update(risk_rules)
+            write_table(write, ["Role", "Resource", "Verbs", "Risk", "Tags"],
+                        permission_rows(sa_perms, False, all_risk_rules))
 
+            # Potential Abuse section
             if all_risk_rules:
-                out += h(4, f"⚠️ Potential Abuse ({len(all_risk_rules)})").rstrip() + "\n"
-                out += "The following security risks were found based on the above permissions:\n\n"
-                for rule_id in sorted(all_risk_rules):
-                    if rule_id in rules_data: # Use passed rules_data
-                        rule = rules_data[rule_id]
-                        out += f"- [{rule['name']}](/rules/{rule_id})\n"
-                out += "\n"
+                write(h(4, f"⚠️ Potential Abuse ({len(all_risk_rules)})").rstrip() + "\n")
+                write("The following security risks were found based on the above permissions:\n\n")
+                # Rules missing from rules_data are counted above but not listed
+                for rule_id in sorted(all_risk_rules & rules_data.keys()):
+                    write(f"- [{rules_data[rule_id]['name']}](/rules/{rule_id})\n")
+                write("\n")
+        else:
+            write(NO_BINDINGS_MD)
 
         # Workloads section
-        sa_wl = wl_by_sa[sa_name]
-        out += h(4, f"📦 Workloads ({len(sa_wl)})").rstrip() + "\n"
+        sa_wl = workloads_grouped[wl_slices.get(sa_name, EMPTY_SLICE)]
+        write(h(4, f"📦 Workloads ({len(sa_wl)})").rstrip() + "\n")
         if sa_wl:
-            wl_rows = [
+            wl_rows = (
                 [w["workloadType"], w["workloadName"],
                  w["containerName"], w["image"]]
                 for w in sa_wl
-            ]
-            out += table(["Kind", "Name", "Container", "Image"], wl_rows)
+            )
+            write_table(write, ["Kind", "Name", "Container", "Image"], wl_rows)
         else:
-            out += "_No workloads use this ServiceAccount._\n\n"
+            write(NO_WORKLOADS_MD)
 
-        out += "---\n\n"
+        write("---\n\n")
 
-    return out
 
 
 # ────────────────────────────── File writer ──────────────────────────────────
+# Directories this process has already created (or found), so the same chart
+# and repo directories are not re-checked with makedirs for every page
+_created_dirs: set = set()
+
+
+def ensure_dir(path: str) -> None:
+    """Creates a directory (and its parents) once per process."""
+    if path in _created_dirs:
+        return
+    os.makedirs(path, exist_ok=True)
+    # makedirs also guarantees every ancestor exists
+    while path and path not in _created_dirs:
+        _created_dirs.add(path)
+        path = os.path.dirname(path)
+
+
+# Last _index.md contents this process wrote, keyed by directory
+_written_indexes: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {}
+
+
+def ensure_index_md(path: str, title: str, description: str = "", sources: List[str] = None) -> None:
+    """
+    Calls create_index_md unless this process has already written the same
+    index to *path*. Every version of a chart shares its index pages, so
+    normally only the first version writes them.
+    """
+    key = (title, description, tuple(sources or ()))
+    if _written_indexes.get(path) == key:
+        return
+    create_index_md(path, title, description, sources)
+    _written_indexes[path] = key
+
+
 def create_index_md(path: str, title: str, description: str = "", sources: List[str] = None) -> None:
     """Creates an _index.md file in the specified directory.
 
@@ -419,21 +515,31 @@ def create_index_md(path: str, title: str, description: str = "", sources: List[
         "" # Extra newline
     ]
 
-    content = "\n".join(index_front_matter)
-    content += f"## {title}\n\n"
+    parts = ["\n".join(index_front_matter), h(2, title)]
 
     if description:
-        content += f"{description}\n\n"
+        parts.append(f"{description}\n\n")
 
     if sources:
-        content += "## Sources\n\n"
-        for source in sources:
-            content += f"- {source}\n"
-        content += "\n"
-
-    os.makedirs(path, exist_ok=True)
-    with open(os.path.join(path, "_index.md"), "w", encoding="utf-8") as fh:
-        fh.write(content)
+        parts.append(h(2, "Sources"))
+        parts.extend(bullet(source) for source in sources)
+        parts.append("\n")
+
+    ensure_dir(path)
+    # Every version of a chart shares this file and may be rendered in a
+    # different worker process, so write a private temporary file and
+    # rename it into place: readers and concurrent writers only ever see
+    # a complete page. Encode once and hand it to the OS in a single write.
+    index_path = os.path.join(path, "_index.md")
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as fh:
+            fh.write("".join(parts).encode("utf-8"))
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 def parse_chart_info(json_file_path: str) -> Tuple[str, str]:
     """Parse repo and chart name from the JSON filename.
@@ -477,44 +583,49 @@ def get_destination_path(meta_data: Dict[str, Any], output_dir: str, json_file_p
     # Return the main content file path
     return os.path.join(chart_dir, f"{version}.md")
 
-def write_markdown(markdown_content: str, meta_data: Dict[str, Any], output_dir: str, json_file_path: str) -> str:
+def write_markdown(data: Dict[str, Any], rules_data: Dict[int, Dict[str, Any]], output_dir: str, json_file_path: str) -> str:
     """
-    Writes the generated Markdown content for an application to a file
+    Renders the Markdown page for an application straight into its file
     and creates _index.md files at each directory level.
 
     Args:
-        markdown_content: The main Markdown content for the application page.
-        meta_data: The metadata dictionary from the JSON input.
+        data: The parsed JSON data representing the knowledge base entry.
+        rules_data: A dictionary of security rules, keyed by rule ID.
         output_dir: The base output directory (site root).
         json_file_path: Path to the source JSON file for repo/chart info.
 
     Returns:
         The full path to the generated main Markdown file.
     """
+    meta_data = data["metadata"]
     repo_name, chart_name = parse_chart_info(json_file_path)
 
-    # Create directory structure
-    charts_dir = os.path.join(output_dir, "charts")
-    repo_dir = os.path.join(charts_dir, repo_name)
-    chart_dir = os.path.join(repo_dir, chart_name)
+    # charts/<repo>/<chart>/<version>.md
+    file_path = get_destination_path(meta_data, output_dir, json_file_path)
+    chart_dir = os.path.dirname(file_path)
+    repo_dir = os.path.dirname(chart_dir)
+
+    # Stream the main content into a private temporary file through a large
+    # write buffer and rename it into place once rendering succeeded: a
+    # failed re-render leaves the previous page intact, and no truncated
+    # page is left behind for later runs to skip as existing.
+    ensure_dir(chart_dir)
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=1 << 16) as fh:
+            render_markdown(data, rules_data, fh.write)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
     # Create repo-level _index.md
-    create_index_md(repo_dir, repo_name, f"Security analysis for {repo_name} charts")
+    ensure_index_md(repo_dir, repo_name, f"Security analysis for {repo_name} charts")
 
     # Create chart-level _index.md with metadata
-    index_description = get_nested_value(meta_data, ['extra', 'helm', 'description'], "")
-    index_sources = get_nested_value(meta_data, ['extra', 'helm', 'sources'], [])
-    create_index_md(chart_dir, chart_name, index_description, index_sources)
-
-    # Remove leading 'v' from version if present
-    version = meta_data['version']
-    if version.startswith("v"):
-        version = version[1:]
-    # Write the main content file
-    file_path = os.path.join(chart_dir, f"{version}.md")
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as fh:
-        fh.write(markdown_content)
+    helm = get_helm_metadata(meta_data)
+    ensure_index_md(chart_dir, chart_name, helm.get("description", ""), helm.get("sources", []))
 
     return file_path
 
@@ -535,103 +646,100 @@ def parse_rules_yaml(yaml_path: str) -> Dict[int, Dict[str, Any]]:
         Exception: If the YAML file cannot be read or parsed.
     """
     try:
-        with open(yaml_path, encoding="utf-8") as fh:
-            rules_list = yaml.safe_load(fh)
+        # Hand the raw bytes to the loader; libyaml decodes them itself
+        with open(yaml_path, "rb") as fh:
+            rules_list = yaml.load(fh.read(), Loader=_YamlSafeLoader)
         # Convert list of rules to a dictionary with rule IDs as keys
         return {rule['id']: rule for rule in rules_list}
     except (IOError, yaml.YAMLError) as exc:
         raise Exception(f"Error reading or parsing rules YAML file '{yaml_path}': {exc}")
 
-def generate_rule_markdown_files(rules_data: Dict[int, Dict[str, Any]], output_dir: str, force: bool = False, verbose: bool = False) -> None:
+def render_rule_markdown(rule: Dict[str, Any]) -> str:
+    """Renders the Markdown page for a single security rule."""
+    # Combine individual verbs and verb groups
+    all_verb_groups = []
+    if 'verb_groups' in rule and rule['verb_groups']:
+        all_verb_groups.extend(rule['verb_groups'])
+    if 'verbs' in rule and rule['verbs']:
+        # Convert each individual verb to a single-item group
+        all_verb_groups.extend([[verb] for verb in rule['verbs']])
+
+    parts = [RULE_PAGE_TEMPLATE.format(
+        id=rule['id'],
+        name=rule['name'],
+        description=rule['description'],
+        category=rule['category'],
+        risk_level=rule['risk_level'],
+        risk_level_display=rule['risk_level'].replace('RiskLevel', ''), # Remove 'RiskLevel' prefix
+        role_type=rule['role_type'],
+        api_groups=", ".join(CORE_API_GROUP if group == '' else group for group in rule['api_groups']),
+        resources=", ".join(rule['resources']),
+        # Format all groups consistently
+        verb_groups=" · ".join(f"[{', '.join(group)}]" for group in all_verb_groups),
+        tags=format_tags_for_markdown(rule.get('tags')),
+    )]
+
+    # Add commands section if available
+    if 'commands' in rule:
+        for i, cmd in enumerate(rule['commands'], 1):
+            if 'description' in cmd:
+                parts.append(f"{i}. {cmd['description']}\n\n")
+            if 'command' in cmd:
+                parts.append(f"```bash\n{cmd['command']}\n```\n\n")
+    return "".join(parts)
+
+def write_rule_markdown_file(rule: Dict[str, Any], destination_path: str, force: bool = False) -> str:
+    """
+    Writes a single rule page, returning "wrote", or "skipped" if the file
+    exists and force is off.
+    """
+    if not force and os.path.exists(destination_path):
+        return "skipped"
+
+    # Encode once and write the markdown file for the rule in a single call
+    with open(destination_path, "wb") as f:
+        f.write(render_rule_markdown(rule).encode("utf-8"))
+    return "wrote"
+
+def generate_rule_markdown_files(rules_data: Dict[int, Dict[str, Any]], output_dir: str, force: bool = False,
+                                 verbose: bool = False, max_workers: int = 16) -> None:
     """
     Generates Markdown files for each rule in the provided rules data.
-    These files are typically placed under 'content/rules/'.
+    These files are typically placed under 'content/rules/'. The pages are
+    small and independent, so they are written from a thread pool.
 
     Args:
         rules_data: A dictionary of security rules, keyed by rule ID.
         output_dir: The base output directory (site root).
         force: Force overwrite existing rule files.
         verbose: Print detailed progress for each rule.
+        max_workers: Maximum number of threads writing rule files.
     """
     rules_dir = os.path.join(output_dir, "rules")
-    os.makedirs(rules_dir, exist_ok=True)
-
-    wrote = 0
-    skipped = 0
-    for rule_id, rule in rules_data.items():
+    ensure_dir(rules_dir)
 
-        destination_path = os.path.join(rules_dir, f"{rule_id}.md")
-        if os.path.exists(destination_path) and not force:
-            skipped += 1
+    paths = [os.path.join(rules_dir, f"{rule_id}.md") for rule_id in rules_data]
+    stats = Counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(partial(write_rule_markdown_file, force=force), rules_data.values(), paths)
+        for destination_path, status in zip(paths, results):
+            stats[status] += 1
             if verbose:
-                print(f"Skipping existing rule: {destination_path}")
-            continue
-
-        # Front matter for the rule page
-        front_matter_lines = [
-            "---",
-            f"id: {rule['id']}",
-            f"title: \"{rule['name']}\"",
-            f"description: \"{rule['description']}\"",
-            f"category: {rule['category']}",
-            f"risk_level: {rule['risk_level']}",
-            "date: \"\"", # Keep as empty string as per original
-            "---",
-            "" # For the extra newline
-        ]
-        content = "\n".join(front_matter_lines)
-
-        # Overview section for the rule
-        content += "## Overview\n\n"
-        content += "| Field | Value |\n"
-        content += "|-------|-------|\n"
-        content += f"| ID | {rule['id']} |\n"
-        content += f"| Name | {rule['name']} |\n"
-        content += f"| Risk Category | {rule['category']} |\n"
-        risk_level_display = rule['risk_level'].replace('RiskLevel', '') # Remove 'RiskLevel' prefix
-        content += f"| Risk Level | {{{{< risk {risk_level_display} >}}}} |\n"
-        content += f"| Role Type | {rule['role_type']} |\n"
-        api_groups_formatted = [CORE_API_GROUP if group == '' else group for group in rule['api_groups']]
-        content += f"| API Groups | {', '.join(api_groups_formatted)} |\n"
-        content += f"| Resources | {', '.join(rule['resources'])} |\n"
-        # Combine individual verbs and verb groups
-        all_verb_groups = []
-        if 'verb_groups' in rule and rule['verb_groups']:
-            all_verb_groups.extend(rule['verb_groups'])
-        if 'verbs' in rule and rule['verbs']:
-            # Convert each individual verb to a single-item group
-            all_verb_groups.extend([[verb] for verb in rule['verbs']])
-        # Format all groups consistently
-        formatted_groups = [f"[{', '.join(group)}]" for group in all_verb_groups]
-        content += f"| Risky Verb Combinations | {' · '.join(formatted_groups)} |\n"
-        content += f"| Tags | {format_tags_for_markdown(rule.get('tags'))} |\n\n"
-
-        # Description section for the rule
-        content += "## Description\n\n"
-        content += f"{rule['description']}\n"
-
-        content += "## Abuse Scenarios\n\n"
-
-        # Add commands section if available
-        if 'commands' in rule:
-            for i, cmd in enumerate(rule['commands'], 1):
-                if 'description' in cmd:
-                    content += f"{i}. {cmd['description']}\n\n"
-                if 'command' in cmd:
-                    content += '```bash\n'
-                    content += f"{cmd['command']}\n"
-                    content += '```\n\n'
-
-        # Write the markdown file for the rule
-        rule_file_path = os.path.join(rules_dir, f"{rule_id}.md")
-        with open(rule_file_path, "w", encoding="utf-8") as f:
-            f.write(content)
-
-        wrote += 1
-        if verbose:
-            print(f"Generated rule file: {rule_file_path}")
+                if status == "wrote":
+                    print(f"Generated rule file: {destination_path}")
+                else:
+                    print(f"Skipping existing rule: {destination_path}")
+
+    print(f"Rules: {stats['wrote']} wrote, {stats['skipped']} skipped "
+          f"(total: {len(rules_data)})")
 
-    print(f"Rules: {wrote} wrote, {skipped} skipped (total: {len(rules_data)})")
+def load_manifest(json_file_path: str) -> Any:
+    """
+    Parses a JSON manifest. The raw bytes go straight to json.loads, which
+    detects the encoding itself, so no decoded copy of the file is made.
+    """
+    with open(json_file_path, "rb") as fh:
+        return json.loads(fh.read())
 
 def process_json_file(json_file_path: str, output_dir: str, rules_data: Dict[int, Dict[str, Any]], force: bool = False, verbose: bool = False) -> str:
     """
@@ -649,8 +757,7 @@ def process_json_file(json_file_path: str, output_dir: str, rules_data: Dict[int
         A status string: "wrote", "skipped", "empty", or "error".
     """
     try:
-        with open(json_file_path, encoding="utf-8") as fh:
-            data = json.load(fh)
+        data = load_manifest(json_file_path)
 
         destination_path = get_destination_path(data["metadata"], output_dir, json_file_path)
         if os.path.exists(destination_path) and not force:
@@ -666,8 +773,7 @@ def process_json_file(json_file_path: str, output_dir: str, rules_data: Dict[int
                 print(f"Skipping empty chart: {json_file_path}")
             return "empty"
 
-        markdown_content = build_markdown(data, rules_data)
-        destination_path = write_markdown(markdown_content, data["metadata"], output_dir, json_file_path)
+        destination_path = write_markdown(data, rules_data, output_dir, json_file_path)
         if verbose:
             print(f"Wrote: {destination_path}")
         return "wrote"
@@ -679,6 +785,30 @@ def process_json_file(json_file_path: str, output_dir: str, rules_data: Dict[int
         return "error"
 
 
+# Rules for the current worker process, installed once by _init_worker so
+# they are not pickled again with every submitted file.
+_worker_rules_data: Dict[int, Dict[str, Any]] = {}
+
+
+def _init_worker(rules_data: Dict[int, Dict[str, Any]]) -> None:
+    """Process pool initializer: stores the parsed rules in this worker."""
+    global _worker_rules_data
+    _worker_rules_data = rules_data
+
+
+def _process_json_file_in_worker(json_file_path: str, output_dir: str, force: bool, verbose: bool) -> str:
+    """
+    Runs process_json_file inside a pool worker with the worker's rules.
+    Unexpected errors are reported here, so one bad file cannot abort the
+    ordered result stream of executor.map.
+    """
+    try:
+        return process_json_file(json_file_path, output_dir, _worker_rules_data, force, verbose)
+    except Exception as exc:
+        print(f"ERROR: {json_file_path}: {exc}")
+        return "error"
+
+
 def main() -> None:
     """
     Main function to parse command-line arguments and orchestrate the
@@ -705,7 +835,7 @@ def main() -> None:
     )
     ap.add_argument(
         '--max-workers', type=int, default=16,
-        help='Maximum number of threads for parallel processing (default: 16)'
+        help='Maximum number of worker processes for parallel processing (default: 16)'
     )
     ap.add_argument(
         '--verbose', action='store_true',
@@ -722,7 +852,7 @@ def main() -> None:
 
     # 2. Generate markdown files for each rule
     try:
-        generate_rule_markdown_files(rules_data, args.output_dir, args.force, args.verbose)
+        generate_rule_markdown_files(rules_data, args.output_dir, args.force, args.verbose, args.max_workers)
     except Exception as exc:
         ap.error(f"Error generating rule markdown files: {exc}")
 
@@ -730,30 +860,27 @@ def main() -> None:
     if not os.path.isdir(args.folder):
         ap.error(f"Input folder not found: '{args.folder}'")
 
-    json_files = [f for f in os.listdir(args.folder) if f.endswith('.json')]
+    # os.scandir hands back each entry's path and file type from the one
+    # directory read, so no per-file stat() or path join is needed.
+    with os.scandir(args.folder) as it:
+        json_files = [e for e in it if e.name.endswith('.json') and e.is_file()]
     if not json_files:
         ap.error(f"No JSON files found in '{args.folder}'.")
 
-    tasks = []
-    for json_file_name in json_files:
-        if json_file_name == "custom-values.json":
-            continue
-        tasks.append(os.path.join(args.folder, json_file_name))
+    tasks = [e.path for e in json_files if e.name != "custom-values.json"]
 
     print(f"Processing {len(tasks)} JSON files with {args.max_workers} workers...")
     stats = Counter()
-    with ThreadPoolExecutor(max_workers=args.max_workers) as executor:
-        futures = {
-            executor.submit(process_json_file, path, args.output_dir, rules_data, args.force, args.verbose): path
-            for path in tasks
-        }
-        for future in as_completed(futures):
-            try:
-                status = future.result()
-                stats[status] += 1
-            except Exception as exc:
-                stats["error"] += 1
-                print(f"ERROR: {futures[future]}: {exc}")
+    # Rendering is CPU-bound, so use processes rather than threads to get
+    # past the GIL; the rules are handed to each worker once, up front, and
+    # files are sent in chunks (a few per worker) to keep IPC overhead low.
+    chunksize = max(1, len(tasks) // (args.max_workers * 4))
+    worker = partial(_process_json_file_in_worker, output_dir=args.output_dir,
+                     force=args.force, verbose=args.verbose)
+    with ProcessPoolExecutor(max_workers=args.max_workers,
+                             initializer=_init_worker, initargs=(rules_data,)) as executor:
+        for status in executor.map(worker, tasks, chunksize=chunksize):
+            stats[status] += 1
 
     print(f"Charts: {stats['wrote']} wrote, {stats['skipped']} skipped, "
           f"{stats['empty']} empty, {stats['error']} errors (total: {len(tasks)})")
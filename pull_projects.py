@@ -1,24 +1,48 @@
 import os
 import re
+import hashlib
+import pickle
 import subprocess
 import yaml
+import requests
 import shutil
 import logging
 import argparse
+import tarfile
 import threading
 import time
-from typing import List, Dict, Any, Optional
+import zlib
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 from pathlib import Path
-from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin
+from uuid import uuid4
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# libyaml's C loader when PyYAML was built with it, the pure-Python one otherwise
+try:
+    from yaml import CSafeLoader as _YamlSafeLoader
+    _HAS_LIBYAML = True
+except ImportError:
+    from yaml import SafeLoader as _YamlSafeLoader
+    _HAS_LIBYAML = False
+
+# Parsed repository index: chart name -> {version: chart archive URL}, in the
+# index's (newest first) order. Either may be None if the entry lacks it.
+RepoIndex = Dict[str, Dict[Optional[str], Optional[str]]]
 
 # --- Configuration Constants ---
 DEFAULT_CONFIG_FILE = "projects.yaml"
 DEFAULT_OUTPUT_DIR = "charts"
-
-# Per-chart-name locks to prevent concurrent helm pulls from clobbering the
-# shared intermediate extraction directory (charts/<chart_name>).
-_chart_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+MANIFESTS_DIR = Path("manifests")
+# Bump when the shape of the parsed index changes, to invalidate old caches
+INDEX_CACHE_FORMAT = 2
+# Hidden directory under the output directory where failed or leftover pulls
+# are moved, to be deleted in the background instead of on the pull path
+TRASH_DIR_NAME = ".trash"
+# Seconds to wait on the chart repository when downloading archives directly
+DOWNLOAD_TIMEOUT = 60
+# Upper bound on processes parsing repository indices at once
+INDEX_LOAD_MAX_WORKERS = 8
 
 # --- Setup Logging ---
 logging.basicConfig(
@@ -77,13 +101,171 @@ def _get_helm_cache_dir() -> Path:
         return Path.home() / ".cache" / "helm" / "repository"
 
 
-def _load_repo_indices(repos: List[Dict[str, str]], helm_cache_dir: Path) -> Dict[str, Any]:
+def _skip_node(events: Iterator[yaml.Event], start: yaml.Event) -> None:
+    """Consumes the remaining events of the node that begins with *start*."""
+    if not isinstance(start, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+        return  # scalars and aliases are a single event
+    depth = 1
+    for event in events:
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def _mapping_items(events: Iterator[yaml.Event]) -> Iterator[Tuple[Optional[str], yaml.Event]]:
     """
-    Parses all repository index.yaml files into an in-memory dictionary.
+    Yields (key, first value event) for the mapping whose start event was just
+    consumed. Non-scalar keys are skipped and reported as None. The caller
+    must consume (or _skip_node) each value before asking for the next item.
+    """
+    for key_event in events:
+        if isinstance(key_event, yaml.MappingEndEvent):
+            return
+        key = key_event.value if isinstance(key_event, yaml.ScalarEvent) else None
+        _skip_node(events, key_event)
+        yield key, next(events)
+
+
+# Plain scalars that YAML resolves to null
+_YAML_NULLS = frozenset({"", "~", "null", "Null", "NULL"})
+
+
+def _entry_version_and_url(events: Iterator[yaml.Event]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Returns the raw 'version' scalar and first 'urls' item of one index
+    entry, skipping every other field.
+    """
+    version = url = None
+    for key, value in _mapping_items(events):
+        if key == "version" and isinstance(value, yaml.ScalarEvent):
+            if not (value.implicit[0] and value.value in _YAML_NULLS):
+                version = value.value
+        elif key == "urls" and isinstance(value, yaml.SequenceStartEvent):
+            for item in events:
+                if isinstance(item, yaml.SequenceEndEvent):
+                    break
+                if url is None and isinstance(item, yaml.ScalarEvent):
+                    url = item.value
+                else:
+                    _skip_node(events, item)
+        else:
+            _skip_node(events, value)
+    return version, url
+
+
+def _parse_index_versions(content: bytes) -> RepoIndex:
+    """
+    Extracts {chart name: {version: archive URL}} from a Helm repository
+    index, keeping the index's (newest first) order. Only the parser's event
+    stream is walked, so the digests, descriptions, maintainers, etc. of
+    every historical release are never built into Python objects. Versions
+    are the scalars as written (e.g. "1.10" stays "1.10"), and None marks an
+    entry without one. If a version is listed twice, the first entry wins.
+    """
+    events = iter(yaml.parse(content, Loader=_YamlSafeLoader))
+    for event in events:
+        if isinstance(event, yaml.DocumentStartEvent):
+            break
+    root = next(events, None)
+    if not isinstance(root, yaml.MappingStartEvent):
+        return {}
+
+    chart_versions: RepoIndex = {}
+    for key, value in _mapping_items(events):
+        if key != "entries" or not isinstance(value, yaml.MappingStartEvent):
+            _skip_node(events, value)
+            continue
+        for chart_name, chart_value in _mapping_items(events):
+            if chart_name is None or not isinstance(chart_value, yaml.SequenceStartEvent):
+                _skip_node(events, chart_value)
+                continue
+            versions: Dict[Optional[str], Optional[str]] = {}
+            for entry in events:
+                if isinstance(entry, yaml.SequenceEndEvent):
+                    break
+                if isinstance(entry, yaml.MappingStartEvent):
+                    version, url = _entry_version_and_url(events)
+                    versions.setdefault(version, url)
+                else:
+                    _skip_node(events, entry)
+            chart_versions[chart_name] = versions
+    return chart_versions
+
+
+def _read_index_cache(cache_file: Path, digest: str) -> Optional[RepoIndex]:
+    """Returns the cached chart versions if *cache_file* was built from an index with this sha256."""
+    try:
+        with open(cache_file, "rb") as f:
+            cached = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable index cache '{cache_file}': {e}")
+        return None
+    if (not isinstance(cached, dict) or cached.get("format") != INDEX_CACHE_FORMAT
+            or cached.get("sha256") != digest):
+        return None
+    return cached.get("entries")
+
+
+def _write_index_cache(cache_file: Path, digest: str, entries: RepoIndex) -> None:
+    """Stores parsed chart versions next to the index, replacing any previous cache atomically."""
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_file, "wb") as f:
+            pickle.dump({"format": INDEX_CACHE_FORMAT, "sha256": digest, "entries": entries},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not write index cache '{cache_file}': {e}")
+        tmp_file.unlink(missing_ok=True)
+
+
+def _load_single_index(repo_name: str, index_file: Path, use_cache: bool) -> Optional[RepoIndex]:
+    """Loads one repository's chart versions, or returns None if its index cannot be read."""
+    try:
+        # Hand the raw bytes to the parser; libyaml decodes them itself
+        with open(index_file, "rb") as f:
+            content = f.read()
+
+        if use_cache:
+            digest = hashlib.sha256(content).hexdigest()
+            cache_file = index_file.with_name(f"{repo_name}-index.parsed.pkl")
+            cached = _read_index_cache(cache_file, digest)
+            if cached is not None:
+                logger.debug(f"Loaded index for '{repo_name}' from cache.")
+                return cached
+
+        # We only care about the chart versions listed under 'entries'
+        entries = _parse_index_versions(content)
+        if use_cache:
+            _write_index_cache(cache_file, digest, entries)
+        logger.debug(f"Successfully loaded index for '{repo_name}'.")
+        return entries
+    except (yaml.YAMLError, OSError) as e:
+        logger.error(f"❌ Failed to load or parse index for repo '{repo_name}': {e}")
+        return None
+
+
+def _load_repo_indices(repos: List[Dict[str, str]], helm_cache_dir: Path,
+                       use_cache: bool = True) -> Dict[str, RepoIndex]:
+    """
+    Parses all repository index.yaml files into an in-memory dictionary of
+    chart versions per repository.
     This is the core of the performance improvement.
+
+    With *use_cache*, the versions extracted from each index are also stored
+    in <repo-name>-index.parsed.pkl, keyed by the index's sha256, so an index
+    that 'helm repo update' left unchanged is not parsed again.
+
+    Indices are parsed in separate processes: walking the YAML events holds
+    the GIL, so threads would not parse two repositories at once.
     """
     logger.info("Pre-loading Helm repository indices for fast version lookups...")
-    repo_indices = {}
+    index_files: Dict[str, Path] = {}
     for repo in repos:
         repo_name = repo.get("name")
         if not repo_name:
@@ -95,32 +277,37 @@ def _load_repo_indices(repos: List[Dict[str, str]], helm_cache_dir: Path) -> Dic
         if not index_file.is_file():
             logger.warning(f"⚠️ Index file not found for repo '{repo_name}' at {index_file}. Did 'helm repo update' fail?")
             continue
+        index_files[repo_name] = index_file
 
-        try:
-            with open(index_file, "r", encoding='utf-8') as f:
-                index_data = yaml.safe_load(f)
-                # We only care about the 'entries' key which contains chart info
-                repo_indices[repo_name] = index_data.get("entries", {})
-            logger.debug(f"Successfully loaded index for '{repo_name}'.")
-        except (yaml.YAMLError, OSError) as e:
-            logger.error(f"❌ Failed to load or parse index for repo '{repo_name}': {e}")
+    repo_indices = {}
+    if index_files:
+        # Bounded so a long repo list doesn't saturate the disk
+        max_workers = min(len(index_files), os.cpu_count() or 1, INDEX_LOAD_MAX_WORKERS)
+        load_args = (index_files.keys(), index_files.values(), [use_cache] * len(index_files))
+        if max_workers == 1:
+            results = list(map(_load_single_index, *load_args))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_load_single_index, *load_args))
+        for repo_name, entries in zip(index_files, results):
+            if entries is not None:
+                repo_indices[repo_name] = entries
 
     logger.info("✅ Repository indices loaded.")
     return repo_indices
 
 
-def _get_latest_version_from_index(chart_name: str, repo_index: Dict[str, Any]) -> str:
+def _get_latest_version_from_index(chart_name: str, repo_index: RepoIndex) -> str:
     """
     Gets the latest chart version directly from the parsed index data.
     This replaces the slow 'helm search repo' command.
     """
     chart_entries = repo_index.get(chart_name)
-    if not chart_entries or not isinstance(chart_entries, list):
+    if not chart_entries or not isinstance(chart_entries, dict):
         raise ValueError(f"Chart '{chart_name}' not found in the repository index.")
 
     # The first entry in the list is the latest version as per Helm's index file structure.
-    latest_chart = chart_entries[0]
-    version = latest_chart.get("version")
+    version = next(iter(chart_entries))
     if not version:
         raise ValueError(f"Could not find a version for chart '{chart_name}' in the index.")
 
@@ -131,7 +318,7 @@ _PRERELEASE_RE = re.compile(r'-(alpha|beta|rc|dev|snapshot|preview|nightly)', re
 
 def _get_all_versions_from_index(
     chart_name: str,
-    repo_index: Dict[str, Any],
+    repo_index: RepoIndex,
     include_prerelease: bool = False,
     max_versions: Optional[int] = None,
 ) -> List[str]:
@@ -140,15 +327,16 @@ def _get_all_versions_from_index(
     index data, newest first.  Pre-release versions are excluded by default.
     """
     chart_entries = repo_index.get(chart_name)
-    if not chart_entries or not isinstance(chart_entries, list):
+    if not chart_entries or not isinstance(chart_entries, dict):
         raise ValueError(f"Chart '{chart_name}' not found in the repository index.")
 
     versions: List[str] = []
-    for entry in chart_entries:
-        version = entry.get("version")
+    for version in chart_entries:
         if not version:
             continue
-        if not include_prerelease and _PRERELEASE_RE.search(version):
+        # Every pre-release tag follows a '-'; the substring test lets plain
+        # releases skip the regex
+        if not include_prerelease and "-" in version and _PRERELEASE_RE.search(version):
             continue
         versions.append(version)
 
@@ -184,9 +372,111 @@ def _update_helm_repos() -> None:
     except subprocess.CalledProcessError:
         logger.warning("⚠️ Some Helm repositories failed to update. Charts from those repos may not resolve. Continuing with available repos.")
 
-def _pull_single_chart(repo_name: str, chart_config: Dict[str, Any], output_base_dir: Path, repo_indices: Dict[str, Any]) -> str:
+def _scan_names(directory: Path, suffix: str = "") -> Set[str]:
+    """
+    Returns the names (without *suffix*) of the entries in *directory* that
+    end with *suffix*, or an empty set if the directory does not exist.
+    """
+    try:
+        with os.scandir(directory) as it:
+            return {e.name[:len(e.name) - len(suffix)] for e in it if e.name.endswith(suffix)}
+    except FileNotFoundError:
+        return set()
+
+
+def _discard(path: Path, trash_dir: Path) -> None:
+    """
+    Moves *path* into *trash_dir* under a unique name, a single rename instead
+    of unlinking every file. Falls back to deleting it in place if the trash
+    directory is missing or on another filesystem.
+    """
+    try:
+        os.rename(path, trash_dir / uuid4().hex)
+    except OSError:
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+
+
+def _empty_trash(trash_dir: Path) -> None:
+    """Deletes everything that has been moved into *trash_dir*."""
+    try:
+        with os.scandir(trash_dir) as it:
+            entries = [(e.path, e.is_dir(follow_symlinks=False)) for e in it]
+    except FileNotFoundError:
+        return
+    for path, is_dir in entries:
+        if is_dir:
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass  # Retried on the next run
+
+
+# One HTTP session per pull thread, so connections to a chart repository are
+# reused across the versions that thread downloads
+_http = threading.local()
+
+
+def _http_session() -> requests.Session:
+    """Returns the calling thread's HTTP session, creating it on first use."""
+    session = getattr(_http, "session", None)
+    if session is None:
+        session = _http.session = requests.Session()
+    return session
+
+
+def _download_chart(chart_url: str, pull_dest: Path) -> bool:
+    """
+    Downloads a chart archive straight from its repository and unpacks it into
+    *pull_dest*, as 'helm pull --untar' would, without starting helm (which
+    would re-read the repository index for every pull). Returns False, with
+    *pull_dest* left empty, if the chart cannot be fetched this way (OCI or
+    other non-HTTP URLs, HTTP errors such as auth being required, bad
+    archives, or a Python without tarfile's 'data' extraction filter).
+    """
+    if not chart_url.startswith(("http://", "https://")) or not hasattr(tarfile, "data_filter"):
+        return False
+
+    logger.info(f"🏃 Downloading: {chart_url}")
+    archive_path = pull_dest / ".chart.tgz"
+    try:
+        with _http_session().get(chart_url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            with open(archive_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+        with tarfile.open(archive_path, "r:gz") as archive:
+            # The 'data' filter rejects absolute paths, '..' and links escaping pull_dest
+            archive.extractall(pull_dest, filter="data")
+        return True
+    # A truncated or corrupt archive surfaces from the gzip layer as EOFError or zlib.error
+    except (requests.RequestException, tarfile.TarError, OSError, EOFError, zlib.error) as e:
+        logger.warning(f"⚠️ Direct download of '{chart_url}' failed, falling back to helm: {e}")
+        # The archive is a single file; delete it here rather than trashing it
+        archive_path.unlink(missing_ok=True)
+        # pull_dest sits directly in the output directory, next to the trash
+        trash_dir = pull_dest.parent / TRASH_DIR_NAME
+        for entry in pull_dest.iterdir():
+            _discard(entry, trash_dir)
+        return False
+    finally:
+        archive_path.unlink(missing_ok=True)
+
+
+def _pull_single_chart(repo_name: str, repo_url: Optional[str], chart_config: Dict[str, Any], output_base_dir: Path,
+                       repo_indices: Dict[str, RepoIndex], existing_manifests: Set[str], existing_charts: Set[str]) -> str:
     """
     Pulls a single Helm chart. Determines version from pre-loaded index if not specified.
+    When the index lists the version's archive URL, the chart is downloaded
+    directly (resolving relative URLs against *repo_url*), falling back to
+    'helm pull' if that fails.
+    *existing_manifests* and *existing_charts* are the names (without
+    extension) already present in manifests/ and the output directory,
+    scanned once by the caller instead of stat'ing both paths per task.
     Returns the final path of the pulled chart for logging.
     """
     chart_name = chart_config.get("name")
@@ -214,53 +504,67 @@ def _pull_single_chart(repo_name: str, chart_config: Dict[str, Any], output_base
     sanitized_repo_name = repo_name.replace('/', '_')
     output_folder_name = f"{sanitized_repo_name}__{chart_name}__{target_version}"
     final_chart_path = output_base_dir / output_folder_name
-    helm_extracted_dir = output_base_dir / chart_name
 
     # Check if manifest already exists
-    manifest_path = Path("manifests") / f"{sanitized_repo_name}__{chart_name}__{target_version}.json"
-    if manifest_path.exists():
+    manifest_path = MANIFESTS_DIR / f"{output_folder_name}.json"
+    if output_folder_name in existing_manifests:
         logger.info(f"✅ Manifest for '{full_chart_ref}' version '{target_version}' already exists at {manifest_path}. Skipping pull.")
         return f"Skipped (manifest exists): {manifest_path}"
 
-    if final_chart_path.exists():
+    if output_folder_name in existing_charts:
         logger.info(f"✅ Chart '{full_chart_ref}' version '{target_version}' already exists. Skipping pull.")
         return f"Skipped (already exists): {final_chart_path}"
 
-    # Serialize pulls of the same chart name so concurrent threads don't
-    # clobber the shared intermediate extraction directory.
-    lock_key = f"{repo_name}/{chart_name}"
-    with _chart_locks[lock_key]:
-        # Clean up any leftover extracted directory from a previous failed run
-        if helm_extracted_dir.exists():
-            shutil.rmtree(helm_extracted_dir)
+    # Each pull extracts into its own temporary directory (hidden, so other
+    # tools scanning the output directory ignore it), so pulls of the same
+    # chart never share an intermediate path and need no locking. It lives in
+    # the output directory to keep the final rename on one filesystem. The
+    # hex suffix never contains the '__' that marks chart directories, so a
+    # directory left behind by a crash is not mistaken for a chart.
+    pull_dest = output_base_dir / f".helmpull-{uuid4().hex}"
+    try:
+        os.mkdir(pull_dest)
+    except OSError as e:
+        logger.error(f"❌ Failed processing chart '{full_chart_ref}': {e}")
+        return ""
+    helm_extracted_dir = pull_dest / chart_name
+
+    chart_url = repo_indices.get(repo_name, {}).get(chart_name, {}).get(target_version)
+    if chart_url and repo_url:
+        chart_url = urljoin(repo_url.rstrip("/") + "/", chart_url)
 
-        pull_cmd = ["helm", "pull", full_chart_ref, "--untar", "--destination", str(output_base_dir)]
-        # Always specify the version for deterministic pulls
-        pull_cmd.extend(["--version", target_version])
+    pull_cmd = ["helm", "pull", full_chart_ref, "--untar", "--destination", str(pull_dest)]
+    # Always specify the version for deterministic pulls
+    pull_cmd.extend(["--version", target_version])
 
-        try:
+    try:
+        if not (chart_url and _download_chart(chart_url, pull_dest)):
             _run_helm_command(pull_cmd)
 
-            if not helm_extracted_dir.exists():
-                 raise ValueError(f"Helm pull completed but expected directory '{helm_extracted_dir}' was not created.")
+        if not helm_extracted_dir.exists():
+             raise ValueError(f"Pull completed but expected directory '{helm_extracted_dir}' was not created.")
 
-            # Rename to the final versioned folder name
-            os.rename(helm_extracted_dir, final_chart_path)
-            logger.info(f"📦 Saved chart '{full_chart_ref}' v'{target_version}' to '{final_chart_path}'.")
+        # Rename to the final versioned folder name
+        os.rename(helm_extracted_dir, final_chart_path)
+        logger.info(f"📦 Saved chart '{full_chart_ref}' v'{target_version}' to '{final_chart_path}'.")
 
-            custom_values_path_str = chart_config.get("values")
-            if custom_values_path_str and Path(custom_values_path_str).exists():
-                shutil.copy2(custom_values_path_str, final_chart_path / "custom-values.yaml")
-                logger.info(f"Copied custom values to '{final_chart_path / 'custom-values.yaml'}'")
+        custom_values_path_str = chart_config.get("values")
+        if custom_values_path_str and Path(custom_values_path_str).exists():
+            shutil.copy2(custom_values_path_str, final_chart_path / "custom-values.yaml")
+            logger.info(f"Copied custom values to '{final_chart_path / 'custom-values.yaml'}'")
 
-            return f"Successfully pulled: {final_chart_path}"
+        return f"Successfully pulled: {final_chart_path}"
 
-        except (subprocess.CalledProcessError, ValueError, OSError) as e:
-            logger.error(f"❌ Failed processing chart '{full_chart_ref}': {e}")
-            # Clean up partial pull
-            if helm_extracted_dir.exists():
-                shutil.rmtree(helm_extracted_dir)
-            return ""
+    except (subprocess.CalledProcessError, ValueError, OSError) as e:
+        logger.error(f"❌ Failed processing chart '{full_chart_ref}': {e}")
+        return ""
+    finally:
+        try:
+            # Normally empty once the chart has been renamed into place
+            pull_dest.rmdir()
+        except OSError:
+            # A partial pull; leave its deletion to the background cleanup
+            _discard(pull_dest, output_base_dir / TRASH_DIR_NAME)
 
 def main():
     """Main function to orchestrate the Helm chart pulling process."""
@@ -274,21 +578,28 @@ def main():
                         help="When used with --all-versions, limit to the N most recent versions per chart.")
     parser.add_argument("--include-prerelease", action="store_true", default=False,
                         help="Include pre-release versions (alpha, beta, rc, etc.) when using --all-versions.")
+    parser.add_argument("--index-cache", action=argparse.BooleanOptionalAction, default=True,
+                        help="Reuse versions parsed from unchanged repository indices on later runs (default: enabled).")
     args = parser.parse_args()
 
+    if not _HAS_LIBYAML:
+        logger.warning("⚠️ PyYAML was built without libyaml; parsing repository indices will be slow. Install libyaml-dev and reinstall PyYAML to speed it up.")
+
     config_file_path = Path(args.config)
     output_base_dir = Path(args.output_dir)
 
+    trash_dir = output_base_dir / TRASH_DIR_NAME
     try:
         output_base_dir.mkdir(parents=True, exist_ok=True)
+        trash_dir.mkdir(exist_ok=True)
         logger.info(f"Ensured output directory exists: '{output_base_dir}'")
     except OSError as e:
         logger.critical(f"❌ Could not create output directory '{output_base_dir}': {e}")
         exit(1)
 
     try:
-        with open(config_file_path, "r", encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        with open(config_file_path, "rb") as f:
+            config = yaml.load(f.read(), Loader=_YamlSafeLoader)
         logger.info(f"Successfully loaded configuration from '{config_file_path}'.")
     except (FileNotFoundError, yaml.YAMLError, Exception) as e:
         logger.critical(f"❌ Critical error loading config file '{config_file_path}': {e}")
@@ -305,12 +616,17 @@ def main():
 
     # OPTIMIZATION: Load all indices into memory at once
     helm_cache_dir = _get_helm_cache_dir()
-    repo_indices = _load_repo_indices(helm_repos, helm_cache_dir)
+    repo_indices = _load_repo_indices(helm_repos, helm_cache_dir, use_cache=args.index_cache)
 
     if args.all_versions:
         logger.info(f"Running in ALL-VERSIONS mode (max_versions={args.max_versions}, include_prerelease={args.include_prerelease}).")
     logger.info(f"Starting concurrent Helm chart pulling (max workers: {args.max_workers})...")
 
+    # Scan once for what is already pulled or analyzed, rather than
+    # stat'ing both paths for every chart version
+    existing_manifests = _scan_names(MANIFESTS_DIR, ".json")
+    existing_charts = _scan_names(output_base_dir)
+
     # OPTIMIZATION: Use a ThreadPoolExecutor to pull charts concurrently
     tasks = []
     with ThreadPoolExecutor(max_workers=args.max_workers) as executor:
@@ -339,13 +655,20 @@ def main():
                     logger.info(f"Found {len(versions)} version(s) for '{repo_name}/{chart_name}'.")
                     for ver in versions:
                         versioned_config = {**chart_config, "version": ver}
-                        future = executor.submit(_pull_single_chart, repo_name, versioned_config, output_base_dir, repo_indices)
+                        future = executor.submit(_pull_single_chart, repo_name, repo.get("url"), versioned_config,
+                                                 output_base_dir, repo_indices, existing_manifests, existing_charts)
                         tasks.append(future)
                 else:
                     # Default: pull latest (or explicit pinned version)
-                    future = executor.submit(_pull_single_chart, repo_name, chart_config, output_base_dir, repo_indices)
+                    future = executor.submit(_pull_single_chart, repo_name, repo.get("url"), chart_config,
+                                         output_base_dir, repo_indices, existing_manifests, existing_charts)
                     tasks.append(future)
 
+        # Empty the trash (including anything left by earlier runs) while
+        # the pulls run
+        trash_cleaner = threading.Thread(target=_empty_trash, args=(trash_dir,), daemon=True)
+        trash_cleaner.start()
+
         # Process results as they complete
         for future in as_completed(tasks):
             try:
@@ -356,6 +679,7 @@ def main():
             except Exception as e:
                 logger.error(f"❌ A chart pull task raised an unexpected exception: {e}")
 
+    trash_cleaner.join()
     logger.info("✅ Helm chart pulling process completed.")
 
 if __name__ == "__main__":